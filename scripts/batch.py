@@ -0,0 +1,84 @@
+"""Run the download and plotting scripts for several events in one go.
+
+Usage: python batch.py [event ...]
+
+The downloads run once for all of the events, so days and datasets shared
+by overlapping events are only fetched and parsed once before the plots of
+every event are made. If any download fails no plots are made, and the
+exit status is non-zero whenever a script failed.
+"""
+import multiprocessing as mp
+import subprocess
+import sys
+
+from data_cache import load_asos
+from events import get_events
+
+def run_script(script):
+    args = ['python']
+    args += script
+    print("Running: ", args)
+    with subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=None) as proc:
+        proc.wait()
+        return script, proc.returncode
+
+def run_scripts(scripts, processes=6):
+    """Run the scripts in a pool of processes and wait for them to finish.
+
+    Returns the scripts that failed.
+    """
+    results = []
+    with mp.Pool(processes=processes) as pool:
+        for script in scripts:
+            pool.apply_async(run_script, args=(script,), callback=results.append)
+        pool.close()
+        pool.join()
+
+    failed = []
+    for script, returncode in results:
+        if returncode != 0:
+            print('Failed with return code {}: {}'.format(returncode, ' '.join(script)))
+            failed.append(script)
+    return failed
+
+def run_events(events):
+    """Download the data of the events and make all of their plots.
+
+    Returns the scripts that failed. The downloads are shared by all of the
+    events, so if any of them fail none of the plots are made.
+    """
+    names = [event.name for event in events]
+    asos_download_scripts = [['get_ASOS.py'] + names]
+    goes_download_scripts = [['get_GOES.py', str(channel)] + names for channel in range(1, 17)]
+    failed = run_scripts(asos_download_scripts + goes_download_scripts)
+    if failed:
+        print('{} downloads failed, not making any plots'.format(len(failed)))
+        return failed
+
+    # Parse the observations once up front, the plotting scripts read the cache
+    for event in events:
+        try:
+            load_asos(event)
+        except Exception as exp:
+            print('Parsing observations for {} failed with {}'.format(event.name, exp))
+            failed.append(['parse observations', event.name])
+
+    scripts = []
+    for event in events:
+        scripts += [['goes_animations.py', str(channel), event.name] for channel in range(1, 17)]
+        scripts += [['temperature_change_map.py', event.name], ['temperature_map.py', event.name],
+                    ['event_static_image.py', event.name]]
+        if event.umbras is not None:
+            scripts += [['event_animation.py', '15', event.name]]
+    failed += run_scripts(scripts)
+
+    if failed:
+        print('{} scripts failed:'.format(len(failed)))
+        for script in failed:
+            print('    ' + ' '.join(script))
+    return failed
+
+
+if __name__ == '__main__':
+    if run_events(get_events(1)):
+        sys.exit(1)
@@ -0,0 +1,85 @@
+"""Shared on-disk stores of the downloaded ASOS and GOES data.
+
+Downloads are stored per day (ASOS) or per file (GOES) so that events with
+overlapping time ranges reuse the same data instead of downloading it again.
+"""
+from datetime import datetime, timedelta
+from functools import lru_cache
+import glob
+import os
+
+import pandas as pd
+
+ASOS_PATH = os.path.join('..', 'data', 'surface_obs')
+
+# Observations loaded around an event, enough for the hourly temperature change
+ASOS_MARGIN = timedelta(hours=2)
+
+
+def asos_filename(day, extension='txt'):
+    """Get the path of the ASOS observations of a day."""
+    return os.path.join(ASOS_PATH, 'ASOS_surface_obs_{:%Y%m%d}.{}'.format(day, extension))
+
+
+@lru_cache(maxsize=None)
+def load_asos_day(day):
+    """Read and parse the ASOS observations of a day.
+
+    The parsed observations are pickled next to the downloaded text so that
+    later runs skip parsing it again.
+    """
+    text_name = asos_filename(day)
+    pickle_name = asos_filename(day, 'pkl')
+    if (os.path.exists(pickle_name)
+            and os.path.getmtime(pickle_name) >= os.path.getmtime(text_name)):
+        return pd.read_pickle(pickle_name)
+
+    df = pd.read_csv(text_name, comment='#', na_values='M',
+                     usecols=['station', 'valid', 'lon', 'lat', 'tmpf'])
+    df['valid'] = pd.to_datetime(df['valid'], format='%Y-%m-%d %H:%M', errors='coerce')
+    for colname in ['lon', 'lat', 'tmpf']:
+        df[colname] = pd.to_numeric(df[colname], errors='coerce')
+    # Write to a temporary file unique to this process so scripts running
+    # side by side never read or replace a partial pickle
+    partial_name = '{}.{}.part'.format(pickle_name, os.getpid())
+    df.to_pickle(partial_name)
+    os.replace(partial_name, pickle_name)
+    return df
+
+
+@lru_cache(maxsize=None)
+def load_asos(event):
+    """Get the ASOS observations within ASOS_MARGIN of an event."""
+    df = pd.concat([load_asos_day(day) for day in event.days(ASOS_MARGIN)],
+                   ignore_index=True)
+    return df[(df['valid'] >= event.start_time - ASOS_MARGIN)
+              & (df['valid'] <= event.end_time + ASOS_MARGIN)]
+
+
+def goes_path(channel):
+    """Get the folder of the GOES datasets of a channel."""
+    return os.path.join('..', 'data', 'satellite', 'Channel{:02d}'.format(channel))
+
+
+def goes_dataset_time(name):
+    """Get the time of a GOES dataset from its name, None if it has none.
+
+    Names look like GOES16_CONUS_20170821_150217_...
+    """
+    try:
+        return datetime.strptime(os.path.basename(name)[13:28], '%Y%m%d_%H%M%S')
+    except ValueError:
+        return None
+
+
+def get_channel_dataset_names(channel, event):
+    """Get the time ordered dataset names of the channel within an event."""
+    names = []
+    for name in glob.glob(os.path.join(goes_path(channel), 'GOES16_CONUS_*')):
+        # Skip downloads that are in progress or were interrupted
+        if name.endswith('.part'):
+            continue
+        time = goes_dataset_time(name)
+        if time is not None and event.start_time <= time <= event.end_time:
+            names.append(name)
+    return sorted(names, key=goes_dataset_time)
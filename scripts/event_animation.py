@@ -1,18 +1,39 @@
+"""Animate the umbra crossing the map.
+
+Usage: python event_animation.py [step [event]]
+
+step is the number of seconds between frames, 15 by default and 1 for full
+resolution. The animation is written to ../animations/event/.
+"""
 import matplotlib
 matplotlib.use('Agg')
 import cartopy.crs as ccrs
 import cartopy.feature as feat
 from cartopy.io import shapereader
 import matplotlib.pyplot as plt
-from matplotlib.animation import ArtistAnimation
+from matplotlib.animation import FuncAnimation
 from matplotlib import patheffects
 from metpy.plots import add_logo
-from datetime import datetime, timedelta
+from datetime import timedelta
+import sys
+
+from events import get_event
+from umbra_paths import add_umbra_collection, project_geometries, read_umbras
+
+# Seconds between animation frames. Defaults to every 15th second to get a
+# nice mix of resolution and speed when playing it back, 1 is full resolution.
+try:
+    step = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+except ValueError:
+    sys.exit(__doc__)
+if step < 1:
+    sys.exit('The step between frames must be at least 1 second, got {}'.format(step))
+event = get_event(2)
+if event.umbras is None:
+    sys.exit('{} has no umbras to animate'.format(event.name))
 
 # Read shapefiles with eclipse data
-umbra_path = shapereader.Reader('../data/eclipse2017_shapefiles/w_upath17.shp')
-center_path = shapereader.Reader('../data/eclipse2017_shapefiles_1s/ucenter17_1s.shp')
-umbras = shapereader.Reader('../data/eclipse2017_shapefiles_1s/umbra17_1s.shp')
+umbra_shapes = read_umbras(event.umbras, step)
 
 # Setup map projection
 proj = ccrs.LambertConformal(central_longitude=-100.0, central_latitude=45.0)
@@ -38,10 +59,14 @@ ax.add_feature(feat.BORDERS, edgecolor='black')
 ax.set_extent([235., 290., 20., 55.])
 
 # Plot a shaded umbra path
-ax.add_geometries(list(umbra_path.geometries()), ccrs.PlateCarree(), edgecolor='None', facecolor='black', alpha=0.5)
+if event.umbra_path is not None:
+    umbra_path = shapereader.Reader(event.umbra_path)
+    ax.add_geometries(list(umbra_path.geometries()), ccrs.PlateCarree(), edgecolor='None', facecolor='black', alpha=0.5)
 
 # Plot the path center
-ax.add_geometries(list(center_path.geometries()), ccrs.PlateCarree(), edgecolor='None', facecolor='red', alpha=0.5)
+if event.center_path is not None:
+    center_path = shapereader.Reader(event.center_path)
+    ax.add_geometries(list(center_path.geometries()), ccrs.PlateCarree(), edgecolor='None', facecolor='red', alpha=0.5)
 
 # Add the MetPy Logo
 fig = add_logo(fig, x=25, y=25, size='large')
@@ -49,23 +74,26 @@ fig = add_logo(fig, x=25, y=25, size='large')
 # Make the text stand out even better using matplotlib's path effects
 outline_effect = [patheffects.withStroke(linewidth=2, foreground='black')]
 
-# Time that the 1 second umbras file begins
-starttime = datetime(2017, 8, 21, 17, 12, 0)
+# Project all of the umbras at once and animate them by swapping the path
+# drawn by a single collection
+umbra_paths = project_geometries(umbra_shapes, proj)
+umbra = add_umbra_collection(ax, umbra_paths[:1], edgecolor='black',
+                             facecolor='#f4d942', alpha=0.5)
+
+text_time = ax.text(0.99, 0.01, '', horizontalalignment='right',
+                    transform=ax.transAxes, color='white',
+                    fontsize='x-large', weight='bold')
+text_time.set_path_effects(outline_effect)
 
-artists = []
-# Only plot every 15th second to get a nice mix of resolution and speed when
-# playing it back.
-for i, shape in enumerate(list(umbras.geometries())[::15]):
-    timestamp = starttime + timedelta(seconds=15 * i)
-    sc = ax.add_geometries([shape], ccrs.PlateCarree(), edgecolor='black', facecolor='#f4d942', alpha=0.5)
 
-    text_time = ax.text(0.99, 0.01, timestamp.strftime('%d %B %Y %H:%M:%SZ'),
-                   horizontalalignment='right', transform=ax.transAxes,
-                   color='white', fontsize='x-large', weight='bold', animated=True)
-    text_time.set_path_effects(outline_effect)
+def update(i):
+    """Show the umbra and timestamp of frame i."""
+    timestamp = event.umbras_start_time + timedelta(seconds=step * i)
+    umbra.set_paths([umbra_paths[i]])
+    text_time.set_text(timestamp.strftime('%d %B %Y %H:%M:%SZ'))
+    return umbra, text_time
 
-    artists.append((sc, text_time))
 
-anim = ArtistAnimation(fig, artists, interval=50., blit=False)
+anim = FuncAnimation(fig, update, frames=len(umbra_paths), interval=50., blit=False)
 
-anim.save('../animations/event_animation.mp4')
+anim.save(event.output_path('animations', 'event_animation.mp4'))
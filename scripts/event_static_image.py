@@ -1,18 +1,23 @@
+"""Plot the eclipse path with the umbra every 5 minutes.
+
+Usage: python event_static_image.py [event]
+
+The image is written to ../plots/event/. Events without umbras get the
+map with just their path.
+"""
 import cartopy.crs as ccrs
 import cartopy.feature as feat
 from cartopy.io import shapereader
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-from matplotlib.animation import ArtistAnimation
 from matplotlib import patheffects
 from metpy.plots import add_logo
-from datetime import datetime, timedelta
 
-# Read shapefiles with eclipse data
-umbra_path = shapereader.Reader('../data/eclipse2017_shapefiles/w_upath17.shp')
-center_path = shapereader.Reader('../data/eclipse2017_shapefiles_1s/ucenter17_1s.shp')
-umbras = shapereader.Reader('../data/eclipse2017_shapefiles_1s/umbra17_1s.shp')
+from events import get_event
+from umbra_paths import add_umbra_collection, project_geometries, read_umbras
+
+event = get_event(1)
 
 # Setup map projection
 proj = ccrs.LambertConformal(central_longitude=-100.0, central_latitude=45.0)
@@ -38,10 +43,14 @@ ax.add_feature(feat.BORDERS, edgecolor='black')
 ax.set_extent([235., 290., 20., 55.])
 
 # Plot a shaded umbra path
-ax.add_geometries(list(umbra_path.geometries()), ccrs.PlateCarree(), edgecolor='None', facecolor='black', alpha=0.5)
+if event.umbra_path is not None:
+    umbra_path = shapereader.Reader(event.umbra_path)
+    ax.add_geometries(list(umbra_path.geometries()), ccrs.PlateCarree(), edgecolor='None', facecolor='black', alpha=0.5)
 
 # Plot the path center
-ax.add_geometries(list(center_path.geometries()), ccrs.PlateCarree(), edgecolor='None', facecolor='red', alpha=0.5)
+if event.center_path is not None:
+    center_path = shapereader.Reader(event.center_path)
+    ax.add_geometries(list(center_path.geometries()), ccrs.PlateCarree(), edgecolor='None', facecolor='red', alpha=0.5)
 
 # Add the MetPy Logo
 fig = add_logo(fig, x=25, y=25, size='large')
@@ -49,7 +58,10 @@ fig = add_logo(fig, x=25, y=25, size='large')
 # Make the text stand out even better using matplotlib's path effects
 outline_effect = [patheffects.withStroke(linewidth=2, foreground='black')]
 
-# Only plot every 5 minutes
-sc = ax.add_geometries(list(umbras.geometries())[::300], ccrs.PlateCarree(), edgecolor='black', facecolor='#f4d942', alpha=0.5)
+# Plot the umbras as one collection of projected paths, only every 5 minutes
+if event.umbras is not None:
+    umbra_shapes = read_umbras(event.umbras, 300)
+    sc = add_umbra_collection(ax, project_geometries(umbra_shapes, proj),
+                              edgecolor='black', facecolor='#f4d942', alpha=0.5)
 
-plt.savefig('../plots/event_path.png', bbox_inches='tight')
+plt.savefig(event.output_path('plots', 'event_path.png'), bbox_inches='tight')
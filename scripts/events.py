@@ -0,0 +1,85 @@
+"""Definitions of the events processed by the scripts.
+
+Each script takes the name of the event to process as an optional trailing
+command line argument and defaults to the 2017 eclipse. To analyze another
+window or eclipse, add an Event to ``events`` below.
+"""
+from collections import namedtuple
+from datetime import datetime, timedelta
+import os
+import sys
+
+DEFAULT_EVENT = 'eclipse2017'
+
+
+class Event(namedtuple('Event', ['name', 'start_time', 'end_time', 'trigger_time',
+                                 'umbra_path', 'center_path', 'umbras',
+                                 'umbras_start_time'])):
+    """A time window to download and plot, with the eclipse shapefiles to draw.
+
+    start_time and end_time bound the observations, trigger_time is when
+    autorun.py fires off the processing. umbra_path and center_path are the
+    shapefiles of the eclipse path and its center, umbras is the 1 second umbra
+    shapefile that begins at umbras_start_time. Any of the shapefiles may be
+    None, such as for a control day without an eclipse.
+    """
+
+    def days(self, margin=timedelta(0)):
+        """Get the dates covered by the event, extended by margin on both ends."""
+        day = (self.start_time - margin).date()
+        last_day = (self.end_time + margin).date()
+        days = []
+        while day <= last_day:
+            days.append(day)
+            day = day + timedelta(days=1)
+        return days
+
+    def frame_times(self, interval):
+        """Get the times from start_time to end_time every interval."""
+        times = []
+        time = self.start_time
+        while time <= self.end_time:
+            times.append(time)
+            time = time + interval
+        return times
+
+    def output_path(self, *names):
+        """Get the path of an output file for the event, creating its folder.
+
+        The first name is the output folder, such as animations or plots.
+        """
+        path = os.path.join('..', names[0], self.name, *names[1:])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+
+shapefiles_2017 = '../data/eclipse2017_shapefiles'
+shapefiles_2017_1s = '../data/eclipse2017_shapefiles_1s'
+
+events = {'eclipse2017': Event(name='eclipse2017',
+                               start_time=datetime(2017, 8, 21, 15),
+                               end_time=datetime(2017, 8, 21, 21),
+                               trigger_time=datetime(2017, 8, 21, 21, 10),
+                               umbra_path=os.path.join(shapefiles_2017, 'w_upath17.shp'),
+                               center_path=os.path.join(shapefiles_2017_1s, 'ucenter17_1s.shp'),
+                               umbras=os.path.join(shapefiles_2017_1s, 'umbra17_1s.shp'),
+                               umbras_start_time=datetime(2017, 8, 21, 17, 12, 0)),
+          # Same window the day before the eclipse, with the path for reference
+          'control2017': Event(name='control2017',
+                               start_time=datetime(2017, 8, 20, 15),
+                               end_time=datetime(2017, 8, 20, 21),
+                               trigger_time=datetime(2017, 8, 20, 21, 10),
+                               umbra_path=os.path.join(shapefiles_2017, 'w_upath17.shp'),
+                               center_path=os.path.join(shapefiles_2017_1s, 'ucenter17_1s.shp'),
+                               umbras=None,
+                               umbras_start_time=None)}
+
+
+def get_events(index):
+    """Get the events named by the command line arguments from index on."""
+    return [events[name] for name in sys.argv[index:]] or [events[DEFAULT_EVENT]]
+
+
+def get_event(index):
+    """Get the event named by command line argument index."""
+    return events[sys.argv[index] if len(sys.argv) > index else DEFAULT_EVENT]
@@ -1,15 +1,18 @@
 import json
 import os
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 from urllib.request import urlopen
 
+from data_cache import ASOS_MARGIN, asos_filename
+from events import get_events
+
 #
-# Only change these start/end times. Goes up to the last hour, but does
-# not include it.
+# Downloads a file of observations per day for the events named on the
+# command line. Days that were completely downloaded after they ended are
+# marked complete and skipped, others are downloaded again.
 #
-start_time = datetime(2017, 8, 21, 15) # 15
-end_time = datetime(2017, 8, 21, 21) # 21
+events = get_events(1)
 
 def download_data(uri, max_attempts=6):
     """Fetch the data from the IEM
@@ -33,17 +36,12 @@ def download_data(uri, max_attempts=6):
         attempt += 1
 
     print('Exhausted attempts to download, returning empty data')
-    return ''
+    return b''
 
 
 
 base_url = 'https://mesonet.agron.iastate.edu/cgi-bin/request/asos.py?'
 
-request_url = base_url + 'data=all&tz=Etc/UTC&format=comma&latlon=yes&'
-
-request_url += start_time.strftime('year1=%Y&month1=%m&day1=%d&')
-request_url += end_time.strftime('year2=%Y&month2=%m&day2=%d&')
-
 states = """AK AL AR AZ CA CO CT DE FL GA HI IA ID IL IN KS KY LA MA MD ME
  MI MN MO MS MT NC ND NE NH NJ NM NV NY OH OK OR PA RI SC SD TN TX UT VA VT
  WA WI WV WY"""
@@ -53,26 +51,49 @@ networks = ['AWOS']
 for state in states.split():
     networks.append('%s_ASOS' % (state,))
 
-# Outfile
-path = os.path.join('..', 'data', 'surface_obs', 'ASOS_surface_obs.txt')
-try:
-    os.remove(path)  # Remove any old data sitting there.
-except:
-    pass
-f = open(path, 'wb')
-
-for network in networks:
-    # Get metadata
-    uri = ('https://mesonet.agron.iastate.edu/'
-           'geojson/network/%s.geojson') % (network,)
-    data = urlopen(uri)
-    jdict = json.load(data)
-    for site in jdict['features']:
-        faaid = site['properties']['sid']
-        sitename = site['properties']['sname']
-        uri = '%s&station=%s' % (request_url, faaid)
-        print(('Network: %s Downloading: %s [%s]'
-               ) % (network, sitename, faaid))
-        data = download_data(uri)
-        f.write(data)
-f.close()
+# Days needed by any of the events, each downloaded once
+days = sorted(set(day for event in events for day in event.days(ASOS_MARGIN)))
+
+for day in days:
+    path = asos_filename(day)
+    complete_path = asos_filename(day, 'complete')
+    if os.path.exists(complete_path):
+        print('Using cached observations for %s' % (day,))
+        continue
+
+    # Only a day that is over can have all of its observations
+    day_ended = day < datetime.utcnow().date()
+    failed_stations = 0
+
+    request_url = base_url + 'data=all&tz=Etc/UTC&format=comma&latlon=yes&'
+    request_url += day.strftime('year1=%Y&month1=%m&day1=%d&')
+    request_url += (day + timedelta(days=1)).strftime('year2=%Y&month2=%m&day2=%d&')
+
+    # Write to a temporary file so an interrupted download is not cached
+    partial_path = '%s.%d.part' % (path, os.getpid())
+    f = open(partial_path, 'wb')
+
+    for network in networks:
+        # Get metadata
+        uri = ('https://mesonet.agron.iastate.edu/'
+               'geojson/network/%s.geojson') % (network,)
+        data = urlopen(uri)
+        jdict = json.load(data)
+        for site in jdict['features']:
+            faaid = site['properties']['sid']
+            sitename = site['properties']['sname']
+            uri = '%s&station=%s' % (request_url, faaid)
+            print(('Network: %s Downloading: %s [%s] %s'
+                   ) % (network, sitename, faaid, day))
+            data = download_data(uri)
+            if not data:
+                failed_stations += 1
+            f.write(data)
+    f.close()
+    os.replace(partial_path, path)
+
+    if day_ended and not failed_stations:
+        open(complete_path, 'w').close()
+    else:
+        print('Observations for %s are incomplete (%d failed stations), they '
+              'will be downloaded again next run' % (day, failed_stations))
@@ -1,6 +1,4 @@
 """Produces animation of GOES 16 ABI channel."""
-import glob
-import os
 import sys
 from datetime import datetime
 
@@ -14,16 +12,29 @@ from metpy.plots import add_logo
 from netCDF4 import Dataset
 import numpy as np
 
+from data_cache import get_channel_dataset_names
+from events import get_event
 
-def get_channel_dataset_names(channel):
-    """Get dataset names associated with the channel."""
-    return glob.glob(os.path.join('..', 'data', 'satellite',
-                                  'Channel{:02d}/*'.format(channel)))
 
+def get_projection(ds):
+    """Get the cartopy projection of a GOES dataset."""
+    data_var = ds.variables['Sectorized_CMI']
+    proj_var = ds.variables[data_var.grid_mapping]
+
+    # Create a Globe specifying a spherical earth with the correct radius
+    globe = ccrs.Globe(ellipse='sphere', semimajor_axis=proj_var.semi_major,
+                       semiminor_axis=proj_var.semi_minor)
+
+    # Create the LCC projection
+    return ccrs.LambertConformal(central_longitude=proj_var.longitude_of_central_meridian,
+                                 central_latitude=proj_var.latitude_of_projection_origin,
+                                 standard_parallels=[proj_var.standard_parallel],
+                                 globe=globe)
 
-def channel_histogram(channel):
+
+def channel_histogram(channel, event):
     """Produce a histogram of the ABI values."""
-    dataset_names = get_channel_dataset_names(channel)
+    dataset_names = get_channel_dataset_names(channel, event)
     first_ds = Dataset(dataset_names[0])
     last_ds = Dataset(dataset_names[-1])
 
@@ -34,38 +45,23 @@ def channel_histogram(channel):
     ax.hist(last_ds.variables['Sectorized_CMI'][:].compressed().flatten(),
             bins=255, alpha=0.5)
     ax.set_title('Channel {}'.format(channel))
-    path = os.path.join('..', 'plots', 'GOES16_Histograms')
-    plt.savefig(os.path.join(path, 'GOES_Channel_{:02d}_Histogram.png'.format(channel)))
+    plt.savefig(event.output_path('plots', 'GOES16_Histograms',
+                                  'GOES_Channel_{:02d}_Histogram.png'.format(channel)))
 
 
-def make_channel_animation(channel):
+def make_channel_animation(channel, event):
     """Create the animation."""
-    datasets = get_channel_dataset_names(channel)
+    datasets = get_channel_dataset_names(channel, event)
 
     # Pull out projection information from the first file,
     # assume it stays the same through the animation
-    ds = Dataset(datasets[0])
-    data_var = ds.variables['Sectorized_CMI']
-    proj_var = ds.variables[data_var.grid_mapping]
-
-    # Create a Globe specifying a spherical earth with the correct radius
-    globe = ccrs.Globe(ellipse='sphere', semimajor_axis=proj_var.semi_major,
-                       semiminor_axis=proj_var.semi_minor)
-
-    # Create the LCC projection
-    proj = ccrs.LambertConformal(central_longitude=proj_var.longitude_of_central_meridian,
-                                 central_latitude=proj_var.latitude_of_projection_origin,
-                                 standard_parallels=[proj_var.standard_parallel],
-                                 globe=globe)
+    proj = get_projection(Dataset(datasets[0]))
 
     # Set up a feature for the state/province lines. Tell cartopy not to fill in the polygons
     state_boundaries = cfeat.NaturalEarthFeature(category='cultural',
                                                  name='admin_1_states_provinces_lakes',
                                                  scale='50m', facecolor='none')
 
-    # Read shapefiles with eclipse data
-    center_path = shapereader.Reader('../data/eclipse2017_shapefiles_1s/ucenter17_1s.shp')
-
     # Create the figure and base map
     fig = plt.figure(figsize=(13.25, 10))
     ax = fig.add_subplot(1, 1, 1, projection=proj)
@@ -77,8 +73,10 @@ def make_channel_animation(channel):
     ax.add_feature(cfeat.BORDERS, linewidth='2', edgecolor='black')
 
     # Plot the path center
-    ax.add_geometries(list(center_path.geometries()), ccrs.PlateCarree(),
-                      edgecolor='None', facecolor='red', alpha=0.5)
+    if event.center_path is not None:
+        center_path = shapereader.Reader(event.center_path)
+        ax.add_geometries(list(center_path.geometries()), ccrs.PlateCarree(),
+                          edgecolor='None', facecolor='red', alpha=0.5)
 
     # List used to store the contents of all frames.
     # Each item in the list is a tuple of (image, text)
@@ -140,15 +138,9 @@ def make_channel_animation(channel):
     # Create the animation--in addition to the required args, we also state that each
     # frame should last 200 milliseconds
     anim = ArtistAnimation(fig, artists, interval=200., blit=False)
-    anim.save(os.path.join('..', 'animations', 'GOES16',
-                           'GOES16_Channel_{:02d}.mp4'.format(channel)))
-
+    anim.save(event.output_path('animations', 'GOES16',
+                                'GOES16_Channel_{:02d}.mp4'.format(channel)))
 
-# Grab the command line argument for the channel
-channel = int(sys.argv[1])
-
-print('Producing histogram of channel {}'.format(channel))
-channel_histogram(channel)
 
 animation_parameters = {1: {'cmap': 'Greys_r', 'norm': plt.Normalize(0, 1)},
                         2: {'cmap': 'Greys_r', 'norm': plt.Normalize(0, 1)},
@@ -167,5 +159,13 @@ animation_parameters = {1: {'cmap': 'Greys_r', 'norm': plt.Normalize(0, 1)},
                         15: {'cmap': 'Greys_r', 'norm': plt.Normalize(200, 330)},
                         16: {'cmap': 'Greys_r', 'norm': plt.Normalize(200, 290)}}
 
-print('Animating channel {}'.format(channel))
-make_channel_animation(channel)
+if __name__ == '__main__':
+    # Grab the command line argument for the channel
+    channel = int(sys.argv[1])
+    event = get_event(2)
+
+    print('Producing histogram of channel {}'.format(channel))
+    channel_histogram(channel, event)
+
+    print('Animating channel {}'.format(channel))
+    make_channel_animation(channel, event)
@@ -0,0 +1,21 @@
+"""Write the frames of an animation as web map tiles.
+
+Usage: python make_tiles.py product [min_zoom max_zoom [event]]
+
+The product is one of temperature, temperature_change, umbra or goes01
+through goes16. Tiles are written to ../tiles/event/product/frame/z/x/y.png
+along with a time index in ../tiles/event/product/index.json.
+"""
+import sys
+
+from events import get_event
+import tiles
+
+product = sys.argv[1]
+min_zoom = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+max_zoom = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+event = get_event(4)
+
+print('Writing {} {} tiles for zoom levels {} to {}'.format(event.name, product,
+                                                          min_zoom, max_zoom))
+tiles.write_tiles(event, product, range(min_zoom, max_zoom + 1))
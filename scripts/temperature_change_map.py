@@ -1,5 +1,5 @@
 """Create a map of temperature change during the eclipse."""
-from datetime import datetime, timedelta
+from datetime import timedelta
 
 import cartopy.crs as ccrs
 import cartopy.feature as feat
@@ -12,16 +12,9 @@ from matplotlib.animation import ArtistAnimation
 from metpy.plots import add_logo
 import pandas as pd
 
-
-def strip_data(df):
-    """Remove unused columns from the data."""
-    names = [' dwpf', ' relh', ' drct',
-             ' sknt', ' p01i', ' alti', ' mslp', ' vsby', ' gust', ' skyc1',
-             ' skyc2', ' skyc3', ' skyc4', ' skyl1', ' skyl2', ' skyl3',
-             ' skyl4', ' presentwx', ' metar']
-    for colname in names:
-        del df[colname]
-    return df
+from data_cache import load_asos
+from events import get_event
+from umbra_paths import add_umbra_collection, project_geometries, read_umbras
 
 
 def get_within_time(df, time, tolerance):
@@ -51,12 +44,8 @@ def get_temperature_change(df, time, span, tolerance):
     return df
 
 
-df = pd.read_csv('../data/surface_obs/ASOS_surface_obs.txt', comment='#', na_values='M')
-df['valid'] = pd.to_datetime(df['valid'], format='%Y-%m-%d %H:%M', errors='coerce')
-df = strip_data(df)
-df['lon'] = pd.to_numeric(df['lon'], errors='coerce')
-df['lat'] = pd.to_numeric(df['lat'], errors='coerce')
-df['tmpf'] = pd.to_numeric(df['tmpf'], errors='coerce')
+event = get_event(1)
+df = load_asos(event)
 
 # Make the text stand out even better using matplotlib's path effects
 outline_effect = [patheffects.withStroke(linewidth=2, foreground='black')]
@@ -81,39 +70,41 @@ ax.add_feature(feat.BORDERS, edgecolor='black')
 # Set plot bounds
 ax.set_extent([235., 290., 20., 55.])
 
-start_time = datetime(2017, 8, 21, 15)
-end_time = datetime(2017, 8, 21, 21)
 interval = timedelta(minutes=10)
 
-# Read shapefiles with eclipse data
-umbra_path = shapereader.Reader('../data/eclipse2017_shapefiles/w_upath17.shp')
-center_path = shapereader.Reader('../data/eclipse2017_shapefiles_1s/ucenter17_1s.shp')
-umbras = shapereader.Reader('../data/eclipse2017_shapefiles_1s/umbra17_1s.shp')
-
 # Add the MetPy Logo
 fig = add_logo(fig, x=0, y=98, size='large')
 
-times = []
+times = event.frame_times(interval)
 artists = []
-time = start_time
-while time <= end_time:
-    times.append(time)
-    time = time + interval
 
 # Plot a shaded umbra path
-ax.add_geometries(list(umbra_path.geometries()), ccrs.PlateCarree(),
-                  edgecolor='None', facecolor='black', alpha=0.5)
+if event.umbra_path is not None:
+    umbra_path = shapereader.Reader(event.umbra_path)
+    ax.add_geometries(list(umbra_path.geometries()), ccrs.PlateCarree(),
+                      edgecolor='None', facecolor='black', alpha=0.5)
 
 # Plot the path center
-ax.add_geometries(list(center_path.geometries()), ccrs.PlateCarree(),
-                  edgecolor='None', facecolor='red', alpha=0.5)
-
-# Time that the 1 second umbras file begins
-umbras_start_time = datetime(2017, 8, 21, 17, 12, 0)
-umbra_shapes = list(umbras.geometries())
-for time in times:
+if event.center_path is not None:
+    center_path = shapereader.Reader(event.center_path)
+    ax.add_geometries(list(center_path.geometries()), ccrs.PlateCarree(),
+                      edgecolor='None', facecolor='red', alpha=0.5)
+
+# Pick the 1 second umbra at each frame time, if the event has any
+frame_umbras = {}
+if event.umbras is not None:
+    umbra_shapes = read_umbras(event.umbras)
+    for i, time in enumerate(times):
+        umbra_number = int((time - event.umbras_start_time).total_seconds())
+        if 0 <= umbra_number < len(umbra_shapes):
+            frame_umbras[i] = umbra_shapes[umbra_number]
+
+# Project the umbras of all frames at once
+umbra_paths = dict(zip(frame_umbras,
+                       project_geometries(list(frame_umbras.values()), proj)))
+
+for i, time in enumerate(times):
     print(time)
-    umbra_number = (time - umbras_start_time).seconds
 
     delta_df = get_temperature_change(df, time, timedelta(hours=1),
                                       timedelta(minutes=10))
@@ -131,15 +122,13 @@ for time in times:
                         weight='bold', animated=True)
     text_time.set_path_effects(outline_effect)
 
-    if umbra_number >= 0:
-        try:
-            scu = ax.add_geometries(umbra_shapes[umbra_number],
-                                    ccrs.PlateCarree(), edgecolor='black',
-                                    facecolor='#f4d942', alpha=0.5)
-            artists.append((sc, scu, text_time))
-        except:
-            # No umbra for this time
-            artists.append((sc, text_time))
+    if i in umbra_paths:
+        scu = add_umbra_collection(ax, [umbra_paths[i]], edgecolor='black',
+                                   facecolor='#f4d942', alpha=0.5)
+        artists.append((sc, scu, text_time))
+    else:
+        # No umbra for this time
+        artists.append((sc, text_time))
 
 
 cb = plt.colorbar(sc, orientation='horizontal', fraction=0.035,
@@ -149,4 +138,4 @@ cb.ax.tick_params(labelsize=12)
 
 anim = ArtistAnimation(fig, artists, interval=400., blit=False)
 
-anim.save('../animations/surface_temperature_change_1hr.mp4')
+anim.save(event.output_path('animations', 'surface_temperature_change_1hr.mp4'))
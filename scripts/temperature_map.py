@@ -6,18 +6,21 @@ import matplotlib.pyplot as plt
 from cartopy.io import shapereader
 from metpy.plots import add_logo
 from matplotlib.animation import ArtistAnimation
-from datetime import datetime, timedelta
+from datetime import timedelta
 import pandas as pd
 from metpy.units import units
 from matplotlib import patheffects
 
+from data_cache import load_asos
+from events import get_event
+
 def get_within_time(df, time, tolerance):
     start_time = time - timedelta(minutes=tolerance)
     end_time = time + timedelta(minutes=tolerance)
     return df[(df['valid']>=start_time) & (df['valid']<=end_time)]
 
-df = pd.read_csv('../data/surface_obs/ASOS_surface_obs.txt', comment='#', na_values='M')
-df['valid'] = pd.to_datetime(df['valid'], format='%Y-%m-%d %H:%M', errors='coerce')
+event = get_event(1)
+df = load_asos(event)
 
 # to Numeric
 #df['lon'] = pd.to_numeric(df['lon']) * units.degrees
@@ -48,19 +51,13 @@ ax.add_feature(feat.BORDERS, edgecolor='black')
 # Set plot bounds
 ax.set_extent([235., 290., 20., 55.])
 
-start_time = datetime(2017, 8, 21, 15) # 15
-end_time = datetime(2017, 8, 21, 21) # 21
 interval = timedelta(minutes=10)
 
 # Add the MetPy Logo
 fig = add_logo(fig, x=0, y=98, size='large')
 
-times = []
+times = event.frame_times(interval)
 artists = []
-time = start_time
-while time <= end_time:
-    times.append(time)
-    time = time + interval
 
 
 for time in times:
@@ -86,4 +83,4 @@ cb.ax.tick_params(labelsize=12)
 
 anim = ArtistAnimation(fig, artists, interval=400., blit=False)
 
-anim.save('../animations/surface_temperatures.mp4')
+anim.save(event.output_path('animations', 'surface_temperatures.mp4'))
@@ -0,0 +1,87 @@
+"""Serve the eclipse tiles over HTTP, rendering missing tiles on demand.
+
+Usage: python tile_server.py [port [cache_size]]
+
+Tiles are served from /event/product/frame/z/x/y.png and the frame times
+from /event/product/index.json. Tiles written by make_tiles.py are read from disk,
+anything else is rendered from the cached GOES and ASOS data. The most
+recently used cache_size tiles are kept in memory.
+
+The server handles one request at a time on purpose since pyplot is not
+thread-safe, so a slow GOES render holds up the other tile requests.
+"""
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import json
+import os
+import sys
+
+from events import events
+import tiles
+
+port = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+cache_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1024
+
+
+@lru_cache(maxsize=cache_size)
+def get_tile(event, product, frame, z, x, y):
+    """Read a written tile or render it if it does not exist."""
+    path = tiles.tile_filename(event, product, frame, z, x, y)
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            return f.read()
+    return tiles.render_tile(event, product, frame, z, x, y)
+
+
+class TileHandler(BaseHTTPRequestHandler):
+    """Handle requests for tiles and time indexes."""
+
+    def do_GET(self):
+        parts = self.path.strip('/').split('/')
+
+        # Check that the event, product and tile exist before rendering
+        # anything, so that only bad requests are answered with a 404
+        try:
+            event = events[parts[0]]
+            product = parts[1]
+            if product not in tiles.products:
+                raise KeyError(product)
+            if len(parts) == 3 and parts[2] == 'index.json':
+                tile = None
+            elif len(parts) == 6 and parts[5].endswith('.png'):
+                frame, z, x = (int(part) for part in parts[2:5])
+                y = int(parts[5][:-len('.png')])
+                tiles.tile_bounds(z, x, y)
+                tile = (frame, z, x, y)
+            else:
+                raise KeyError(self.path)
+        except (KeyError, IndexError, ValueError):
+            self.send_error(404)
+            return
+
+        try:
+            index = tiles.time_index(event, product)
+            if tile is None:
+                body = json.dumps(index).encode('utf-8')
+                content_type = 'application/json'
+            elif 0 <= tile[0] < len(index['frames']):
+                body = get_tile(event, product, *tile)
+                content_type = 'image/png'
+            else:
+                self.send_error(404)
+                return
+        except Exception as exp:
+            self.log_error('Rendering %s failed with %r', self.path, exp)
+            self.send_error(500)
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(body)
+
+
+print('Serving tiles on http://localhost:{}/'.format(port))
+HTTPServer(('localhost', port), TileHandler).serve_forever()
@@ -0,0 +1,238 @@
+"""Render the eclipse animations as web map (z/x/y) tiles."""
+from datetime import timedelta
+from functools import lru_cache, partial
+from io import BytesIO
+import json
+import math
+import os
+
+import matplotlib
+matplotlib.use('Agg')
+import cartopy.crs as ccrs
+import matplotlib.pyplot as plt
+from netCDF4 import Dataset
+import numpy as np
+import pandas as pd
+
+from data_cache import get_channel_dataset_names, goes_dataset_time, load_asos
+from goes_animations import animation_parameters, get_projection
+from umbra_paths import add_umbra_collection, project_geometries, read_umbras
+
+# Tiles are square images of this many pixels
+TILE_SIZE = 256
+
+# Half the width of the spherical mercator world in meters
+MERCATOR_HALF_WIDTH = 20037508.342789244
+
+# Longitude/latitude bounds of the tiles written out for each frame
+MAP_EXTENT = [-125., -70., 20., 55.]
+
+TILE_PATH = os.path.join('..', 'tiles')
+
+# Time between temperature frames, same as the temperature animations
+TEMPERATURE_INTERVAL = timedelta(minutes=10)
+
+# Seconds between umbra frames
+UMBRA_STEP = 15
+
+# GOES pixels kept around a tile's window so its edges are fully covered
+GOES_MARGIN = 2
+
+
+def tile_bounds(z, x, y):
+    """Get the spherical mercator extent (x0, x1, y0, y1) of tile z/x/y."""
+    if not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise ValueError('Tile {}/{}/{} does not exist'.format(z, x, y))
+    size = 2 * MERCATOR_HALF_WIDTH / 2 ** z
+    x0 = -MERCATOR_HALF_WIDTH + x * size
+    y1 = MERCATOR_HALF_WIDTH - y * size
+    return x0, x0 + size, y1 - size, y1
+
+
+def tile_ranges(z, extent=MAP_EXTENT):
+    """Get the x and y tile ranges at zoom z covering a lon/lat extent."""
+    n = 2 ** z
+
+    def tile_index(lon, lat):
+        x = int((lon + 180.) / 360. * n)
+        y = int((1. - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2. * n)
+        return min(x, n - 1), min(y, n - 1)
+
+    west, east, south, north = extent
+    x0, y0 = tile_index(west, north)
+    x1, y1 = tile_index(east, south)
+    return range(x0, x1 + 1), range(y0, y1 + 1)
+
+
+def frame_times_temperature(event):
+    """Get the times of the temperature frames."""
+    return event.frame_times(TEMPERATURE_INTERVAL)
+
+
+def get_within_time(df, time, tolerance):
+    """Get data within tolerance of time."""
+    return df[(df['valid'] >= time - tolerance) & (df['valid'] <= time + tolerance)]
+
+
+def draw_temperature(event, ax, frame):
+    """Plot the station temperatures of a frame."""
+    df = get_within_time(load_asos(event), frame_times_temperature(event)[frame],
+                         timedelta(minutes=5))
+    ax.scatter(df['lon'], df['lat'], c=df['tmpf'], transform=ccrs.PlateCarree(),
+               cmap=plt.get_cmap('plasma'), norm=plt.Normalize(30, 100))
+
+
+def draw_temperature_change(event, ax, frame):
+    """Plot the 1 hour station temperature change of a frame."""
+    df = load_asos(event)
+    time = frame_times_temperature(event)[frame]
+    tolerance = timedelta(minutes=10)
+    df = pd.merge(get_within_time(df, time - timedelta(hours=1), tolerance),
+                  get_within_time(df, time, tolerance),
+                  on='station', suffixes=('_first', ''))
+    ax.scatter(df['lon'], df['lat'], c=df['tmpf'] - df['tmpf_first'],
+               transform=ccrs.PlateCarree(),
+               cmap=plt.get_cmap('coolwarm'), norm=plt.Normalize(-10, 10))
+
+
+@lru_cache(maxsize=None)
+def get_umbra_paths(umbras):
+    """Get the umbra frames projected to spherical mercator."""
+    if umbras is None:
+        return []
+    return project_geometries(read_umbras(umbras, UMBRA_STEP), ccrs.GOOGLE_MERCATOR)
+
+
+def frame_times_umbra(event):
+    """Get the times of the umbra frames."""
+    return [event.umbras_start_time + timedelta(seconds=UMBRA_STEP * i)
+            for i in range(len(get_umbra_paths(event.umbras)))]
+
+
+def draw_umbra(event, ax, frame):
+    """Plot the umbra of a frame."""
+    add_umbra_collection(ax, [get_umbra_paths(event.umbras)[frame]], edgecolor='black',
+                         facecolor='#f4d942', alpha=0.5)
+
+
+# Full resolution GOES images can be hundreds of MB each, so only keep
+# enough of them in memory for panning around a frame or two
+@lru_cache(maxsize=3)
+def load_goes(name):
+    """Read the image data, x and y coordinates and projection of a GOES dataset."""
+    with Dataset(name) as nc:
+        x = np.asarray(nc.variables['x'][:])
+        y = np.asarray(nc.variables['y'][:])
+        img_data = nc.variables['Sectorized_CMI'][:]
+        proj = get_projection(nc)
+
+    # Remove GOES artifact where center of eclipse is white
+    img_data[np.where(img_data <= 0.0001)] = 0
+    return img_data, x, y, proj
+
+
+@lru_cache(maxsize=None)
+def get_frame_dataset_names(channel, event):
+    """Get the dataset names of the GOES frames, cached like the time index."""
+    return tuple(get_channel_dataset_names(channel, event))
+
+
+def frame_times_goes(channel, event):
+    """Get the times of the GOES frames of a channel."""
+    return [goes_dataset_time(name) for name in get_frame_dataset_names(channel, event)]
+
+
+def goes_window(coords, low, high, size):
+    """Get a slice of the coordinates covering low to high with about size points.
+
+    The slice is padded by GOES_MARGIN pixels and strided so cartopy never
+    has to warp many more pixels than end up in the tile.
+    """
+    indices = np.where((coords >= low) & (coords <= high))[0]
+    if not len(indices):
+        return None
+    start = max(indices[0] - GOES_MARGIN, 0)
+    stop = min(indices[-1] + GOES_MARGIN + 1, len(coords))
+    return slice(start, stop, max((stop - start) // size, 1))
+
+
+def draw_goes(channel, event, ax, frame):
+    """Plot the part of the GOES image of a frame within the tile."""
+    img_data, x, y, proj = load_goes(get_frame_dataset_names(channel, event)[frame])
+
+    # Only hand cartopy the pixels within the tile, at about the tile's resolution
+    west, east, south, north = ax.get_extent(crs=proj)
+    columns = goes_window(x, west, east, 2 * TILE_SIZE)
+    rows = goes_window(y, south, north, 2 * TILE_SIZE)
+    if columns is None or rows is None:
+        return
+    x = x[columns]
+    y = y[rows]
+
+    channel_params = animation_parameters[channel]
+    ax.imshow(img_data[rows, columns], extent=(x.min(), x.max(), y.min(), y.max()),
+              transform=proj, origin='upper',
+              cmap=channel_params['cmap'], norm=channel_params['norm'])
+
+
+# Functions giving the frame times and drawing a frame for each product
+products = {'temperature': (frame_times_temperature, draw_temperature),
+            'temperature_change': (frame_times_temperature, draw_temperature_change),
+            'umbra': (frame_times_umbra, draw_umbra)}
+for channel in range(1, 17):
+    products['goes{:02d}'.format(channel)] = (partial(frame_times_goes, channel),
+                                              partial(draw_goes, channel))
+
+
+@lru_cache(maxsize=None)
+def time_index(event, product):
+    """Get the time of each frame of an event's product."""
+    frame_times, _ = products[product]
+    return {'event': event.name,
+            'product': product,
+            'tiles': '{frame}/{z}/{x}/{y}.png',
+            'frames': [{'frame': i, 'time': time.strftime('%Y-%m-%dT%H:%M:%SZ')}
+                       for i, time in enumerate(frame_times(event))]}
+
+
+def render_tile(event, product, frame, z, x, y):
+    """Render tile z/x/y of an event's product frame as a transparent PNG."""
+    _, draw = products[product]
+    if not 0 <= frame < len(time_index(event, product)['frames']):
+        raise IndexError('{} has no frame {}'.format(product, frame))
+    x0, x1, y0, y1 = tile_bounds(z, x, y)
+
+    fig = plt.figure(figsize=(TILE_SIZE / 72., TILE_SIZE / 72.), dpi=72)
+    ax = fig.add_axes([0, 0, 1, 1], projection=ccrs.GOOGLE_MERCATOR)
+    ax.set_axis_off()
+    ax.set_extent([x0, x1, y0, y1], crs=ccrs.GOOGLE_MERCATOR)
+    draw(event, ax, frame)
+
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png', dpi=72, transparent=True)
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def tile_filename(event, product, frame, z, x, y):
+    """Get the path of a written tile."""
+    return os.path.join(TILE_PATH, event.name, product, str(frame), str(z), str(x),
+                        '{}.png'.format(y))
+
+
+def write_tiles(event, product, zooms):
+    """Write the time index and every tile of every frame of an event's product."""
+    index = time_index(event, product)
+    os.makedirs(os.path.join(TILE_PATH, event.name, product), exist_ok=True)
+    with open(os.path.join(TILE_PATH, event.name, product, 'index.json'), 'w') as f:
+        json.dump(index, f, indent=2)
+
+    for frame in range(len(index['frames'])):
+        for z in zooms:
+            x_range, y_range = tile_ranges(z)
+            for x in x_range:
+                os.makedirs(os.path.dirname(tile_filename(event, product, frame, z, x, 0)),
+                            exist_ok=True)
+                for y in y_range:
+                    with open(tile_filename(event, product, frame, z, x, y), 'wb') as f:
+                        f.write(render_tile(event, product, frame, z, x, y))
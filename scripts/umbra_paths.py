@@ -0,0 +1,65 @@
+"""Convert eclipse umbra shapes to projected matplotlib paths in one batch."""
+import cartopy.crs as ccrs
+from cartopy.io import shapereader
+from matplotlib.collections import PathCollection
+from matplotlib.path import Path
+import numpy as np
+
+
+def read_umbras(filename, step=1):
+    """Read every `step`th umbra geometry from a 1 second umbra shapefile."""
+    return list(shapereader.Reader(filename).geometries())[::step]
+
+
+def geometry_rings(geometry):
+    """Yield the (lon, lat) coordinates of each ring of a (multi)polygon."""
+    for polygon in getattr(geometry, 'geoms', [geometry]):
+        yield np.asarray(polygon.exterior.coords)[:, :2]
+        for interior in polygon.interiors:
+            yield np.asarray(interior.coords)[:, :2]
+
+
+def project_geometries(geometries, proj, src_crs=ccrs.PlateCarree()):
+    """Project polygon geometries to one path per geometry.
+
+    The vertices of every ring are stacked and projected with a single
+    call to ``transform_points`` instead of going through cartopy's feature
+    pipeline once per geometry.
+    """
+    rings = []
+    rings_per_geometry = []
+    for geometry in geometries:
+        geometry_ring_list = list(geometry_rings(geometry))
+        rings.extend(geometry_ring_list)
+        rings_per_geometry.append(len(geometry_ring_list))
+
+    if not rings:
+        return [Path(np.empty((0, 2))) for _ in rings_per_geometry]
+
+    points = np.concatenate(rings)
+    projected = proj.transform_points(src_crs, points[:, 0], points[:, 1])[:, :2]
+    splits = np.cumsum([len(ring) for ring in rings])[:-1]
+    projected_rings = np.split(projected, splits)
+
+    paths = []
+    start = 0
+    for count in rings_per_geometry:
+        ring_paths = [Path(ring, closed=True)
+                      for ring in projected_rings[start:start + count]]
+        start += count
+        if ring_paths:
+            paths.append(Path.make_compound_path(*ring_paths))
+        else:
+            paths.append(Path(np.empty((0, 2))))
+    return paths
+
+
+def add_umbra_collection(ax, paths, **kwargs):
+    """Draw projected umbra paths on the map as a single collection.
+
+    The collection is drawn in the axes data (projection) coordinates, so its
+    paths can be swapped with ``set_paths`` to animate the umbra.
+    """
+    collection = PathCollection(paths, transform=ax.transData, **kwargs)
+    ax.add_collection(collection, autolim=False)
+    return collection